@@ -3,14 +3,20 @@ Trading Strategy Scaling Calculator - Main Streamlit Application
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from pathlib import Path
+from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import threading
 import traceback
 
-# Import our custom modules
-from calculator import StrategyCalculator
-from visualizations import VisualizationEngine
+# Our custom modules pull in pandas/NumPy/Plotly, so they are imported on first
+# use rather than here - the welcome screen renders without loading them, and
+# warm_imports() loads them in the background meanwhile.
+if TYPE_CHECKING:
+    import pandas as pd
+    from calculator import StrategyCalculator
 
 # Page configuration
 st.set_page_config(
@@ -20,21 +26,42 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_data(show_spinner=False)
+def read_text(path: str, mtime: float) -> str:
+    """Read a text file; mtime is part of the cache key so edits are picked up."""
+    return Path(path).read_text()
+
 # Load custom CSS
 def load_css():
     """Load the custom CSS theme."""
+    # Runs on every rerun: one stat for the cache key, no exists() check first
     css_file = Path("theme.css")
-    if css_file.exists():
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    try:
+        mtime = css_file.stat().st_mtime
+    except FileNotFoundError:
+        return
+    css = read_text(str(css_file), mtime)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+@st.cache_resource(show_spinner=False)
+def warm_imports() -> threading.Thread:
+    """Import the calculation and chart modules off the script thread, once per process."""
+    def load():
+        # Importing calculator compiles its Numba kernels (or loads them from
+        # the disk cache), so the first Run click doesn't pay for it
+        for module in ("calculator", "visualizations"):
+            importlib.import_module(module)
+
+    thread = threading.Thread(target=load, name="warm-imports", daemon=True)
+    thread.start()
+    return thread
 
 load_css()
+warm_imports()
 
 # Initialize session state
 if 'calculator' not in st.session_state:
-    st.session_state.calculator = StrategyCalculator()
-if 'viz_engine' not in st.session_state:
-    st.session_state.viz_engine = VisualizationEngine()
+    st.session_state.calculator = None
 if 'data_loaded' not in st.session_state:
     st.session_state.data_loaded = False
 if 'calculations_done' not in st.session_state:
@@ -45,133 +72,220 @@ if 'trigger_calculation' not in st.session_state:
     st.session_state.trigger_calculation = False
 if 'sample_data_loaded' not in st.session_state:
     st.session_state.sample_data_loaded = None
+if 'metrics' not in st.session_state:
+    st.session_state.metrics = {}
+if 'input_key' not in st.session_state:
+    st.session_state.input_key = None
+if 'figs' not in st.session_state:
+    st.session_state.figs = {}
+if 'tables' not in st.session_state:
+    st.session_state.tables = {}
+if 'metrics_html' not in st.session_state:
+    st.session_state.metrics_html = ''
+if 'run_requested' not in st.session_state:
+    st.session_state.run_requested = False
 
 def load_sample_data():
     """Load the sample data for testing."""
     try:
         sample_file = Path("design/SOURCE_DATA_EXAMPLE.csv")
         if sample_file.exists():
-            with open(sample_file, 'r') as f:
-                return f.read()
+            return read_text(str(sample_file), sample_file.stat().st_mtime)
     except Exception as e:
         st.error(f"Error loading sample data: {str(e)}")
     return None
 
-def display_metrics(metrics: dict):
-    """Display performance metrics in a formatted layout."""
-    if not metrics:
-        return
-    
-    # Original Strategy Metrics
-    st.subheader("📊 Original Strategy Performance")
+def request_run():
+    """Button callback: ask the upcoming full run to (re)calculate."""
+    st.session_state.run_requested = True
+
+def clear_data():
+    """Button callback: reset all data-related session state before the rerun."""
+    st.session_state.csv_input = ""
+    st.session_state.last_csv_input = ""
+    st.session_state.data_loaded = False
+    st.session_state.calculations_done = False
+    st.session_state.metrics = {}
+    st.session_state.metrics_html = ''
+    st.session_state.input_key = None
+    st.session_state.figs = {}
+    st.session_state.tables = {}
+    st.session_state.sample_data_loaded = None
+    st.session_state.trigger_calculation = False
+    # Reset calculator
+    st.session_state.calculator = None
+
+def load_sample_into_input():
+    """Button callback: load the sample data into the text area before the rerun."""
+    sample_data = load_sample_data()
+    # Recorded so the button only reports success when there was data to load
+    st.session_state.sample_data_loaded = bool(sample_data)
+    if sample_data:
+        st.session_state.csv_input = sample_data
+
+# Cached results are bounded so a long-running server doesn't keep every paste
+# and parameter set it has ever seen; eight result sets are kept per cache.
+@st.cache_data(show_spinner=False, max_entries=8)
+def parse_cached(csv_text: str) -> "pd.DataFrame":
+    """Parse pasted data once per distinct input text."""
+    from calculator import StrategyCalculator
+    return StrategyCalculator().parse_csv_data(csv_text)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def scale_cached(csv_text: str, starting_capital: float, risk_percentage: float) -> "StrategyCalculator":
+    """Run the scaling calculation once per distinct (text, capital, risk) combination."""
+    from calculator import StrategyCalculator
+    # Keyed on the exact text: Streamlit hashes only a sample of the rows of a
+    # large DataFrame argument, so two different big pastes could collide
+    calculator = StrategyCalculator()
+    calculator.calculate_scaling(parse_cached(csv_text), starting_capital, risk_percentage)
+    # Compute metrics here too so they are memoized on the cached calculator
+    calculator.calculate_performance_metrics()
+    return calculator
+
+# Eight figures per result set
+@st.cache_resource(show_spinner=False, max_entries=64)
+def build_chart(name: str, input_key: int, chart: str, _args: tuple):
+    """Build a chart once per result set; reruns reuse the same Plotly figure."""
+    # Keyed on the figure's name and the exact-input key of the results it draws.
+    # _args is left unhashed: Streamlit hashes only a sample of the rows of a
+    # large DataFrame, so two different big result sets could collide
+    from visualizations import VisualizationEngine
+    return getattr(VisualizationEngine(), chart)(*_args)
+
+def build_charts(builders: dict) -> dict:
+    """Run independent chart builders concurrently; a failed build is kept as its exception."""
+    # Workers inherit this run's context so the cached build_chart works there too
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=6, initializer=add_script_run_ctx, initargs=(None, ctx)) as pool:
+        futures = {name: pool.submit(builder) for name, builder in builders.items()}
+    figs = {}
+    for name, future in futures.items():
+        try:
+            figs[name] = future.result()
+        except Exception as e:
+            figs[name] = e
+    return figs
+
+def session_chart(name: str):
+    """Return the named figure built for the current results, re-raising if its build failed."""
+    fig = st.session_state.figs[name]
+    if isinstance(fig, Exception):
+        raise fig
+    return fig
+
+def to_display(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Prepare a results table for st.dataframe: compact, Arrow-backed columns."""
+    import pandas as pd
+    import pyarrow as pa
+
+    # Arrow-backed columns go to the browser without another conversion pass.
+    # float64 columns are narrowed to float32 where cents survive the cast
+    # (float32 resolves steps finer than half a cent only below 2**16); both
+    # conversions happen in a single astype so the table is copied once.
+    # Types come from the Arrow schema rather than each NumPy dtype, which
+    # pyarrow can't map for extension dtypes such as tz-aware datetimes.
+    arrow_types = {}
+    for field in pa.Schema.from_pandas(df, preserve_index=False):
+        if field.type == pa.float64() and df[field.name].abs().max() < 2 ** 16:
+            arrow_types[field.name] = pd.ArrowDtype(pa.float32())
+        else:
+            arrow_types[field.name] = pd.ArrowDtype(field.type)
+    return df.astype(arrow_types)
+
+def session_table(name: str, df: "pd.DataFrame") -> "pd.DataFrame":
+    """Return the display copy of a results table, converting it at most once per calculation."""
+    tables = st.session_state.tables
+    if name not in tables:
+        tables[name] = to_display(df)
+    return tables[name]
+
+def metrics_html(metrics: dict) -> str:
+    """Render the three metric sections as a single markdown/HTML string."""
+    def card_html(value: str, label: str) -> str:
+        return (
+            f'<div class="custom-metric">'
+            f'<div class="custom-metric-value">{value}</div>'
+            f'<div class="custom-metric-label">{label}</div>'
+            f'</div>'
+        )
+
     orig = metrics['original']
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">${orig['total_pnl']:,.2f}</div>
-            <div class="custom-metric-label">Total P&L</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">{orig['win_rate']:.1%}</div>
-            <div class="custom-metric-label">Win Rate</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">${orig['avg_win']:,.2f}</div>
-            <div class="custom-metric-label">Avg Win</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">${orig['max_drawdown']:,.2f}</div>
-            <div class="custom-metric-label">Max Drawdown</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Scaled Strategy Metrics
-    st.subheader("🚀 Scaled Strategy Performance")
     scaled = metrics['scaled']
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">${scaled['final_capital']:,.2f}</div>
-            <div class="custom-metric-label">Final Capital</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">{scaled['total_return_pct']:,.1f}%</div>
-            <div class="custom-metric-label">Total Return</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">${scaled['avg_win']:,.2f}</div>
-            <div class="custom-metric-label">Avg Scaled Win</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">{scaled['max_drawdown_pct']:,.1f}%</div>
-            <div class="custom-metric-label">Max Drawdown %</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Position Sizing Metrics
-    st.subheader("⚖️ Position Sizing Details")
     pos = metrics['position_sizing']
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">${pos['max_loss_used']:,.2f}</div>
-            <div class="custom-metric-label">Max Loss Used</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">{pos['risk_percentage']:.1%}</div>
-            <div class="custom-metric-label">Risk Per Trade</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">{pos['max_position_size']:,}</div>
-            <div class="custom-metric-label">Max Position Size</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
-        <div class="custom-metric">
-            <div class="custom-metric-value">{pos['avg_position_size']:,.1f}</div>
-            <div class="custom-metric-label">Avg Position Size</div>
-        </div>
-        """, unsafe_allow_html=True)
+
+    sections = [
+        ("📊 Original Strategy Performance", [
+            (f"${orig['total_pnl']:,.2f}", "Total P&L"),
+            (f"{orig['win_rate']:.1%}", "Win Rate"),
+            (f"${orig['avg_win']:,.2f}", "Avg Win"),
+            (f"${orig['max_drawdown']:,.2f}", "Max Drawdown"),
+        ]),
+        ("🚀 Scaled Strategy Performance", [
+            (f"${scaled['final_capital']:,.2f}", "Final Capital"),
+            (f"{scaled['total_return_pct']:,.1f}%", "Total Return"),
+            (f"${scaled['avg_win']:,.2f}", "Avg Scaled Win"),
+            (f"{scaled['max_drawdown_pct']:,.1f}%", "Max Drawdown %"),
+        ]),
+        ("⚖️ Position Sizing Details", [
+            (f"${pos['max_loss_used']:,.2f}", "Max Loss Used"),
+            (f"{pos['risk_percentage']:.1%}", "Risk Per Trade"),
+            (f"{pos['max_position_size']:,}", "Max Position Size"),
+            (f"{pos['avg_position_size']:,.1f}", "Avg Position Size"),
+        ]),
+    ]
+
+    # Emit all three sections as one markdown element rather than twelve
+    return "\n\n".join(
+        f'### {heading}\n\n<div class="metric-grid">{"".join(card_html(v, l) for v, l in cards)}</div>'
+        for heading, cards in sections
+    )
+
+def display_metrics(metrics: dict):
+    """Display performance metrics in a formatted layout, formatting them once per calculation."""
+    if not metrics:
+        return
+    if not st.session_state.metrics_html:
+        st.session_state.metrics_html = metrics_html(metrics)
+    st.markdown(st.session_state.metrics_html, unsafe_allow_html=True)
+
+@st.fragment
+def sidebar_inputs():
+    """Sidebar inputs; editing them reruns only this fragment."""
+    # Data input
+    csv_input = st.text_area(
+        "Paste Data (CSV or Tab-Delimited)",
+        height=200,
+        placeholder="Date,PnL\n2024-01-01,1.50\n2024-01-02,-2.30\n\nOr tab-delimited from Excel/SSMS:\nDate\tPnL\n2024-01-01\t1.50\n2024-01-02\t-2.30",
+        key="csv_input",
+        help="Supports CSV, tab-delimited (Excel), or semicolon-delimited data. Just copy and paste from Excel, SSMS, or any spreadsheet!"
+    )
+
+    st.number_input(
+        "Starting Capital ($)",
+        min_value=1.0,
+        value=100.0,
+        step=10.0,
+        format="%.2f",
+        key="starting_capital"
+    )
+
+    st.number_input(
+        "Risk Percentage (%)",
+        min_value=0.1,
+        max_value=100.0,
+        value=10.0,
+        step=0.1,
+        format="%.1f",
+        key="risk_percentage"
+    )
+
+    # Show data status
+    if csv_input.strip():
+        lines_count = len([line for line in csv_input.strip().split('\n') if line.strip()])
+        st.info(f"📊 Data ready: {lines_count} lines detected")
+    else:
+        st.warning("📝 No data entered yet")
 
 def main():
     """Main application function."""
@@ -182,87 +296,56 @@ def main():
     
     # Sidebar for inputs
     with st.sidebar:
-        # Data input
-        csv_input = st.text_area(
-            "Paste Data (CSV or Tab-Delimited)",
-            height=200,
-            placeholder="Date,PnL\n2024-01-01,1.50\n2024-01-02,-2.30\n\nOr tab-delimited from Excel/SSMS:\nDate\tPnL\n2024-01-01\t1.50\n2024-01-02\t-2.30",
-            key="csv_input",
-            help="Supports CSV, tab-delimited (Excel), or semicolon-delimited data. Just copy and paste from Excel, SSMS, or any spreadsheet!"
-        )
-
-        starting_capital = st.number_input(
-            "Starting Capital ($)",
-            min_value=1.0,
-            value=100.0,
-            step=10.0,
-            format="%.2f"
-        )
-
-        risk_percentage = st.number_input(
-            "Risk Percentage (%)",
-            min_value=0.1,
-            max_value=100.0,
-            value=10.0,
-            step=0.1,
-            format="%.1f"
-        ) / 100  # Convert to decimal
-
-        # Use the data from the text area
-        data_to_use = csv_input
-
-        # Show data status
-        if data_to_use.strip():
-            lines_count = len([line for line in data_to_use.strip().split('\n') if line.strip()])
-            st.info(f"📊 Data ready: {lines_count} lines detected")
-        else:
-            st.warning("📝 No data entered yet")
+        sidebar_inputs()
 
+        # Buttons sit outside the fragment: a click is one full app run, with
+        # the callbacks updating state before it starts
         # Calculate button
-        calculate_button = st.button("🚀 Run", type="primary")
+        st.button("🚀 Run", type="primary", on_click=request_run)
 
         # Clear data button
-        if st.button("🗑️ Clear Data", help="Clear all data and reset the calculator"):
-            # Clear all data-related session state
-            st.session_state.csv_input = ""
-            st.session_state.last_csv_input = ""
-            st.session_state.data_loaded = False
-            st.session_state.calculations_done = False
-            st.session_state.sample_data_loaded = None
-            st.session_state.trigger_calculation = False
-            # Reset calculator
-            st.session_state.calculator = StrategyCalculator()
-            st.success("Data cleared!")
-            st.rerun()
+        if st.button("🗑️ Clear Data", help="Clear all data and reset the calculator", on_click=clear_data):
+            st.toast("Data cleared!")
 
         # Sample data button (moved to bottom)
-        if st.button("🔄 Load Sample Data", help="Load the provided sample data for testing"):
-            sample_data = load_sample_data()
-            if sample_data:
-                # Clear any existing data and load sample data into the text area
-                st.session_state.csv_input = sample_data
-                st.success("Sample data loaded into text area!")
-                st.rerun()
-
-        # Determine if we should calculate
-        should_calculate = calculate_button
+        if st.button("🔄 Load Sample Data", help="Load the provided sample data for testing", on_click=load_sample_into_input):
+            if st.session_state.sample_data_loaded:
+                st.toast("Sample data loaded into text area!")
+
+    data_to_use = st.session_state.csv_input
+    starting_capital = st.session_state.starting_capital
+    risk_percentage = st.session_state.risk_percentage / 100  # Convert to decimal
+
+    # Determine if we should calculate - skip the work when the inputs
+    # match those behind the results already on screen. The paste is only
+    # hashed when Run was pressed, not on every other full rerun
+    should_calculate = False
+    if st.session_state.run_requested:
+        st.session_state.run_requested = False
+        input_key = hash((data_to_use, starting_capital, risk_percentage))
+        inputs_unchanged = st.session_state.calculations_done and input_key == st.session_state.input_key
+        should_calculate = not inputs_unchanged
     
     # Main content area
     if should_calculate and data_to_use.strip():
         try:
             with st.spinner("Processing data and calculating scaling..."):
-                # Parse the CSV data
-                original_data = st.session_state.calculator.parse_csv_data(data_to_use)
+                # Parse the CSV data (cached on the raw text)
+                original_data = parse_cached(data_to_use)
                 st.session_state.data_loaded = True
                 
-                # Calculate scaling
-                scaled_data = st.session_state.calculator.calculate_scaling(
-                    original_data, starting_capital, risk_percentage
+                # Calculate scaling (cached on the raw text and parameters)
+                st.session_state.calculator = scale_cached(
+                    data_to_use, starting_capital, risk_percentage
                 )
                 
-                # Calculate metrics
-                metrics = st.session_state.calculator.calculate_performance_metrics()
+                # Calculate metrics once; the display block reads them from session state
+                st.session_state.metrics = st.session_state.calculator.calculate_performance_metrics()
+                st.session_state.metrics_html = ''
                 st.session_state.calculations_done = True
+                st.session_state.input_key = input_key
+                st.session_state.figs = {}
+                st.session_state.tables = {}
                 
                 st.success(f"✅ Successfully processed {len(original_data)} trading days!")
                 
@@ -276,12 +359,48 @@ def main():
         # Get data from calculator
         original_data = st.session_state.calculator.original_data
         scaled_data = st.session_state.calculator.scaled_data
-        metrics = st.session_state.calculator.calculate_performance_metrics()
+        metrics = st.session_state.metrics
         starting_capital = st.session_state.calculator.starting_capital
         
         # Display metrics
         display_metrics(metrics)
         
+        # Build every chart for these results once, overlapping the builds in a
+        # thread pool; rendering below stays sequential as Streamlit requires
+        if not st.session_state.figs:
+            calculator = st.session_state.calculator
+            key = st.session_state.input_key
+            st.session_state.figs = build_charts({
+                "orig_equity": lambda: build_chart(
+                    "orig_equity", key, "create_equity_curve",
+                    (original_data, "Original Strategy - Equity Curve", "original", starting_capital)
+                ),
+                "orig_daily": lambda: build_chart(
+                    "orig_daily", key, "create_daily_waterfall",
+                    (original_data, "Original Strategy - Daily P&L", "original", starting_capital)
+                ),
+                "orig_weekly": lambda: build_chart(
+                    "orig_weekly", key, "create_weekly_waterfall",
+                    (calculator.get_weekly_data("original"), "Original Strategy - Weekly P&L")
+                ),
+                "scaled_equity": lambda: build_chart(
+                    "scaled_equity", key, "create_equity_curve",
+                    (scaled_data, "Scaled Strategy - Equity Curve", "scaled")
+                ),
+                "scaled_daily": lambda: build_chart(
+                    "scaled_daily", key, "create_daily_waterfall",
+                    (scaled_data, "Scaled Strategy - Daily P&L", "scaled")
+                ),
+                "scaled_weekly": lambda: build_chart(
+                    "scaled_weekly", key, "create_weekly_waterfall",
+                    (calculator.get_weekly_data("scaled"), "Scaled Strategy - Weekly P&L")
+                ),
+                "comparison": lambda: build_chart(
+                    "comparison", key, "create_comparison_chart", (original_data, scaled_data, starting_capital)
+                ),
+                "position": lambda: build_chart("position", key, "create_position_size_chart", (scaled_data,)),
+            })
+        
         # Create visualizations
         st.header("📊 Visualizations")
         
@@ -293,28 +412,21 @@ def main():
 
             # Original equity curve
             try:
-                orig_equity_fig = st.session_state.viz_engine.create_equity_curve(
-                    original_data, "Original Strategy - Equity Curve", "original", starting_capital
-                )
+                orig_equity_fig = session_chart("orig_equity")
                 st.plotly_chart(orig_equity_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating equity curve: {str(e)}")
 
             # Original daily waterfall
             try:
-                orig_daily_fig = st.session_state.viz_engine.create_daily_waterfall(
-                    original_data, "Original Strategy - Daily P&L", "original", starting_capital
-                )
+                orig_daily_fig = session_chart("orig_daily")
                 st.plotly_chart(orig_daily_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating daily waterfall: {str(e)}")
 
             # Original weekly waterfall
             try:
-                orig_weekly_data = st.session_state.calculator.get_weekly_data("original")
-                orig_weekly_fig = st.session_state.viz_engine.create_weekly_waterfall(
-                    orig_weekly_data, "Original Strategy - Weekly P&L"
-                )
+                orig_weekly_fig = session_chart("orig_weekly")
                 st.plotly_chart(orig_weekly_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating weekly waterfall: {str(e)}")
@@ -324,28 +436,21 @@ def main():
 
             # Scaled equity curve
             try:
-                scaled_equity_fig = st.session_state.viz_engine.create_equity_curve(
-                    scaled_data, "Scaled Strategy - Equity Curve", "scaled"
-                )
+                scaled_equity_fig = session_chart("scaled_equity")
                 st.plotly_chart(scaled_equity_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating scaled equity curve: {str(e)}")
 
             # Scaled daily waterfall
             try:
-                scaled_daily_fig = st.session_state.viz_engine.create_daily_waterfall(
-                    scaled_data, "Scaled Strategy - Daily P&L", "scaled"
-                )
+                scaled_daily_fig = session_chart("scaled_daily")
                 st.plotly_chart(scaled_daily_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating scaled daily waterfall: {str(e)}")
 
             # Scaled weekly waterfall
             try:
-                scaled_weekly_data = st.session_state.calculator.get_weekly_data("scaled")
-                scaled_weekly_fig = st.session_state.viz_engine.create_weekly_waterfall(
-                    scaled_weekly_data, "Scaled Strategy - Weekly P&L"
-                )
+                scaled_weekly_fig = session_chart("scaled_weekly")
                 st.plotly_chart(scaled_weekly_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating scaled weekly waterfall: {str(e)}")
@@ -355,14 +460,14 @@ def main():
 
         # Comparison chart
         try:
-            comparison_fig = st.session_state.viz_engine.create_comparison_chart(original_data, scaled_data, starting_capital)
+            comparison_fig = session_chart("comparison")
             st.plotly_chart(comparison_fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating comparison chart: {str(e)}")
 
         # Position size chart
         try:
-            position_fig = st.session_state.viz_engine.create_position_size_chart(scaled_data)
+            position_fig = session_chart("position")
             st.plotly_chart(position_fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating position size chart: {str(e)}")
@@ -373,10 +478,10 @@ def main():
         tab1, tab2 = st.tabs(["Original Data", "Scaled Data"])
         
         with tab1:
-            st.dataframe(original_data, use_container_width=True)
+            st.dataframe(session_table("original", original_data), use_container_width=True)
         
         with tab2:
-            st.dataframe(scaled_data, use_container_width=True)
+            st.dataframe(session_table("scaled", scaled_data), use_container_width=True)
     
     elif not st.session_state.data_loaded:
         # Welcome message
@@ -7,17 +7,167 @@ import numpy as np
 from datetime import datetime
 from typing import Tuple, Dict, Any
 import io
+import math
+import pyarrow as pa
+import pyarrow.csv as pacsv
+try:
+    from numba import njit, types
+    _HAVE_NUMBA = True
+except ImportError:  # Numba is optional; the kernels then run as plain Python
+    types = None
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+if _HAVE_NUMBA:
+    # Kernels are declared with explicit signatures so Numba compiles them when this
+    # module is imported (or loads them from the on-disk cache) instead of on the
+    # first calculation a user triggers. Inputs are typed read-only so they accept
+    # the read-only views pandas hands out as well as ordinary arrays.
+    _f8_in = types.Array(types.float64, 1, 'A', readonly=True)
+    _i8_out = types.int64[:]
+    _f8_out = types.float64[:]
+    _COMPOUND_SIG = types.Tuple((_f8_out, _i8_out, _f8_out, _f8_out))(
+        _f8_in, types.float64, types.float64, types.float64)
+    _SIGN_SUMS_SIG = types.Tuple((types.float64, types.int64, types.int64, types.float64, types.float64))(_f8_in)
+else:
+    _COMPOUND_SIG = _SIGN_SUMS_SIG = None
+
+
+@njit(_COMPOUND_SIG, cache=True)
+def _compound(pnl: np.ndarray, starting_capital: float, risk_percentage: float,
+              max_loss: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run the daily position-sizing and compounding recurrence.
+
+    Args:
+        pnl: Per-unit P&L for each day, oldest first
+        starting_capital: Initial capital amount
+        risk_percentage: Risk percentage per trade (0.1 = 10%)
+        max_loss: Absolute value of the largest single-day loss
+
+    Returns:
+        Tuple of (StartingBR, Position_Size, Scaled_PnL, EndingBR) arrays
+    """
+    n = pnl.shape[0]
+    starting_br = np.empty(n, dtype=np.float64)
+    position_size = np.empty(n, dtype=np.int64)
+    scaled_pnl = np.empty(n, dtype=np.float64)
+    ending_br = np.empty(n, dtype=np.float64)
+
+    current_capital = starting_capital
+    for i in range(n):
+        starting_br[i] = current_capital
+
+        # Position size: FLOOR((Current Capital × Risk %) ÷ Max Loss). Floor the
+        # true quotient: float // rounds differently (1.0 // 0.1 == 9.0, not 10)
+        quotient = (current_capital * risk_percentage) / max_loss
+        # Numba's float-to-int conversion wraps silently past int64 (and plain
+        # Python raises OverflowError), so reject it the same way on both paths.
+        # The negated range test also catches NaN.
+        if not (-9.223372036854775808e18 <= quotient < 9.223372036854775808e18):
+            raise ValueError("Position size overflow: capital has grown beyond what a 64-bit position size can hold")
+        size = math.floor(quotient)
+        position_size[i] = size
+
+        scaled = pnl[i] * size
+        scaled_pnl[i] = scaled
+
+        current_capital += scaled
+        ending_br[i] = current_capital
+
+    return starting_br, position_size, scaled_pnl, ending_br
+
+
+@njit(_SIGN_SUMS_SIG, cache=True)
+def _sign_sums(pnl: np.ndarray) -> Tuple[float, int, int, float, float]:
+    """
+    Total the P&L and split it into wins and losses in a single branchless pass.
+
+    Args:
+        pnl: P&L value for each day
+
+    Returns:
+        Tuple of (total, win count, loss count, sum of wins, sum of losses)
+    """
+    total = 0.0
+    wins = 0
+    losses = 0
+    pos_sum = 0.0
+    neg_sum = 0.0
+    for i in range(pnl.shape[0]):
+        x = pnl[i]
+        total += x
+        wins += x > 0
+        losses += x < 0
+        pos_sum += max(x, 0.0)
+        neg_sum += min(x, 0.0)
+    return total, wins, losses, pos_sum, neg_sum
+
+
+def _pnl_stats(pnl: np.ndarray) -> Dict[str, Any]:
+    """
+    Compute trade statistics for a P&L series without boolean-indexed copies.
+
+    Args:
+        pnl: P&L value for each day
+
+    Returns:
+        Dictionary with total_pnl, win_rate, avg_win, avg_loss and total_trades
+    """
+    if _HAVE_NUMBA:
+        total, wins, losses, pos_sum, neg_sum = _sign_sums(pnl)
+    else:
+        # A Python loop would be slower than NumPy's separate passes here.
+        # Clipping at zero leaves the other side's rows contributing nothing,
+        # which sums the winners/losers without a boolean-indexed copy
+        total = pnl.sum()
+        wins = np.count_nonzero(pnl > 0)
+        losses = np.count_nonzero(pnl < 0)
+        pos_sum = np.maximum(pnl, 0).sum()
+        neg_sum = np.minimum(pnl, 0).sum()
+    return {
+        'total_pnl': total,
+        'win_rate': wins / pnl.size if pnl.size > 0 else 0,
+        'avg_win': pos_sum / wins if wins > 0 else 0,
+        'avg_loss': neg_sum / losses if losses > 0 else 0,
+        'total_trades': pnl.size
+    }
+
+
+def _drawdown(curve: np.ndarray) -> Tuple[float, float]:
+    """
+    Find the deepest drop of a running total below its previous peak.
+
+    Args:
+        curve: Cumulative P&L or account balance over time
+
+    Returns:
+        Tuple of (max drawdown as a non-positive number, highest peak)
+    """
+    running_max = np.maximum.accumulate(curve)
+    return (curve - running_max).min(), running_max[-1]
 
 
 class StrategyCalculator:
     """Core calculation engine for trading strategy scaling with position sizing and compounding."""
     
+    # Pastes shorter than this are tried with the split-based fast parser first
+    FAST_PARSE_MAX_CHARS = 100_000
+    
     def __init__(self):
         self.original_data = None
         self.scaled_data = None
         self.max_loss = None
         self.starting_capital = None
         self.risk_percentage = None
+        # Metrics for the current scaled_data; cleared whenever it is recalculated
+        self._metrics_cache = None
     
     def parse_csv_data(self, csv_content: str) -> pd.DataFrame:
         """
@@ -31,42 +181,51 @@ class StrategyCalculator:
             DataFrame with Date and PnL columns
         """
         try:
-            # Auto-detect delimiter (comma, tab, or semicolon)
+            # Auto-detect delimiter (comma, tab, or semicolon) from the first
+            # non-blank line only, rather than counting across the whole paste
+            first_line = next((line for line in io.StringIO(csv_content) if line.strip()), '')
             delimiter = ','
-            if '\t' in csv_content and csv_content.count('\t') > csv_content.count(','):
+            if first_line.count('\t') > first_line.count(','):
                 delimiter = '\t'
-            elif ';' in csv_content and csv_content.count(';') > csv_content.count(','):
+            elif first_line.count(';') > first_line.count(','):
                 delimiter = ';'
 
-            # Try to read the data with detected delimiter
-            df = pd.read_csv(io.StringIO(csv_content), delimiter=delimiter)
-            
-            # Remove any unnamed columns or empty rows
-            df = df.dropna(how='all')
-            
-            # Find date and PnL columns (case insensitive, flexible naming)
-            date_col = None
-            pnl_col = None
+            # Small, simple pastes (the common case) skip pandas' parser setup;
+            # anything the fast path can't handle cleanly goes through read_csv
+            parsed = None
+            if len(csv_content) < self.FAST_PARSE_MAX_CHARS:
+                parsed = self._parse_simple(csv_content, delimiter)
+            if parsed is None:
+                parsed = self._parse_arrow(csv_content, delimiter)
             
-            for col in df.columns:
-                col_lower = str(col).lower().strip()
-                if any(keyword in col_lower for keyword in ['date', 'time', 'day']):
-                    date_col = col
-                elif any(keyword in col_lower for keyword in ['pnl', 'p&l', 'profit', 'loss', 'return', 'result']):
-                    pnl_col = col
+            if parsed is not None:
+                date_values, pnl_values = parsed
+            else:
+                # Fall back to the C parser. Read the header alone first so the
+                # full pass only tokenizes and types the Date and PnL columns.
+                # UTF-8 bytes feed the tokenizer without a str-to-bytes conversion
+                raw = csv_content.encode('utf-8')
+                header = pd.read_csv(io.BytesIO(raw), delimiter=delimiter, engine='c', nrows=0)
+                date_idx, pnl_idx = self._find_columns(header.columns)
+                df = pd.read_csv(io.BytesIO(raw), delimiter=delimiter, engine='c',
+                                 usecols=[date_idx, pnl_idx])
+                
+                # Remove any empty rows
+                df = df.dropna(how='all')
+                
+                # usecols keeps file order, so map the positions onto the two columns read
+                date_values = df[header.columns[date_idx]]
+                
+                # Only coerce PnL if the parser couldn't type it
+                pnl_values = df[header.columns[pnl_idx]]
+                if pnl_values.dtype != np.float64:
+                    pnl_values = pd.to_numeric(pnl_values, errors='coerce')
             
-            if date_col is None or pnl_col is None:
-                # If headers not found, assume first two columns are Date and PnL
-                if len(df.columns) >= 2:
-                    date_col = df.columns[0]
-                    pnl_col = df.columns[1]
-                else:
-                    raise ValueError("Could not identify Date and PnL columns")
-            
-            # Create clean dataframe
+            # Create clean dataframe. PnL is float64 whichever path parsed it
+            # (integer pastes come back int64 from Arrow and read_csv)
             clean_df = pd.DataFrame({
-                'Date': df[date_col],
-                'PnL': pd.to_numeric(df[pnl_col], errors='coerce')
+                'Date': date_values,
+                'PnL': np.asarray(pnl_values, dtype=np.float64)
             })
             
             # Remove rows with invalid PnL values
@@ -87,6 +246,101 @@ class StrategyCalculator:
         except Exception as e:
             raise ValueError(f"Error parsing CSV data: {str(e)}")
     
+    @staticmethod
+    def _find_columns(columns) -> Tuple[int, int]:
+        """
+        Locate the Date and PnL columns by header name (case insensitive, flexible naming).
+
+        Args:
+            columns: Column headers in file order
+
+        Returns:
+            Tuple of (date column position, PnL column position)
+        """
+        date_idx = None
+        pnl_idx = None
+        
+        for i, col in enumerate(columns):
+            col_lower = str(col).lower().strip()
+            if any(keyword in col_lower for keyword in ['date', 'time', 'day']):
+                date_idx = i
+            elif any(keyword in col_lower for keyword in ['pnl', 'p&l', 'profit', 'loss', 'return', 'result']):
+                pnl_idx = i
+        
+        if date_idx is None or pnl_idx is None:
+            # If headers not found, assume first two columns are Date and PnL
+            if len(columns) >= 2:
+                return 0, 1
+            raise ValueError("Could not identify Date and PnL columns")
+        
+        return date_idx, pnl_idx
+    
+    def _parse_simple(self, csv_content: str, delimiter: str):
+        """
+        Fast path for small, well-formed pastes: split lines directly instead of running read_csv.
+
+        Args:
+            csv_content: Raw CSV or tab-delimited content as string
+            delimiter: Field delimiter
+
+        Returns:
+            Tuple of (date strings, float64 PnL array), or None if the input needs the full parser
+        """
+        # Quoting, ragged rows and non-numeric PnL cells are left to read_csv
+        if '"' in csv_content:
+            return None
+        
+        lines = [line for line in csv_content.splitlines() if line.strip()]
+        if len(lines) < 2:
+            return None
+        
+        header = lines[0].split(delimiter)
+        rows = [line.split(delimiter) for line in lines[1:]]
+        if any(len(row) != len(header) for row in rows):
+            return None
+        
+        date_idx, pnl_idx = self._find_columns(header)
+        try:
+            pnl = np.array([row[pnl_idx] for row in rows], dtype=np.float64)
+        except ValueError:
+            return None
+        
+        return [row[date_idx] for row in rows], pnl
+    
+    def _parse_arrow(self, csv_content: str, delimiter: str):
+        """
+        Parse with PyArrow's multithreaded CSV reader, typing columns in the same pass.
+
+        Args:
+            csv_content: Raw CSV or tab-delimited content as string
+            delimiter: Field delimiter
+
+        Returns:
+            Tuple of (Date values, PnL values) as Series, or None if the input needs read_csv
+        """
+        # Ragged rows and columns whose types change part way through raise here
+        try:
+            table = pacsv.read_csv(
+                pa.py_buffer(csv_content.encode('utf-8')),
+                parse_options=pacsv.ParseOptions(delimiter=delimiter)
+            )
+        except pa.ArrowInvalid:
+            return None
+        
+        date_idx, pnl_idx = self._find_columns(table.column_names)
+        dates = table.column(date_idx)
+        pnl = table.column(pnl_idx)
+        
+        # Non-numeric PnL cells are left to read_csv and to_numeric's coercion
+        if not (pa.types.is_floating(pnl.type) or pa.types.is_integer(pnl.type)):
+            return None
+        
+        # ISO dates come back typed; match the resolution pd.to_datetime gives strings
+        if pa.types.is_date(dates.type) or (pa.types.is_timestamp(dates.type) and dates.type.tz is None):
+            dates = dates.cast(pa.timestamp('us'))
+        
+        return dates.to_pandas(), pnl.to_pandas()
+    
     def calculate_scaling(self, data: pd.DataFrame, starting_capital: float, risk_percentage: float) -> pd.DataFrame:
         """
         Apply position sizing and compounding to the trading data.
@@ -99,9 +353,11 @@ class StrategyCalculator:
         Returns:
             DataFrame with scaling calculations
         """
+        self._metrics_cache = None
         self.starting_capital = starting_capital
         self.risk_percentage = risk_percentage
-        self.original_data = data.copy()
+        # Kept by reference; the input frame is treated as read-only
+        self.original_data = data
         
         # Calculate maximum loss (most negative PnL value)
         self.max_loss = abs(data['PnL'].min())
@@ -109,34 +365,21 @@ class StrategyCalculator:
         if self.max_loss == 0:
             raise ValueError("Maximum loss is zero - cannot calculate position sizing")
         
-        # Initialize result dataframe
-        result = data.copy()
-        result['StartingBR'] = 0.0
-        result['Position_Size'] = 0
-        result['Scaled_PnL'] = 0.0
-        result['EndingBR'] = 0.0
-        result['Cumulative_PnL'] = 0.0
+        starting_br, position_size, scaled_pnl, ending_br = _compound(
+            data['PnL'].to_numpy(dtype=np.float64),
+            float(starting_capital),
+            float(risk_percentage),
+            float(self.max_loss)
+        )
         
-        current_capital = starting_capital
-        
-        for i in range(len(result)):
-            # Starting bankroll for this day
-            result.loc[i, 'StartingBR'] = current_capital
-            
-            # Calculate position size: FLOOR((Current Capital × Risk %) ÷ Max Loss)
-            position_size = int(np.floor((current_capital * risk_percentage) / self.max_loss))
-            result.loc[i, 'Position_Size'] = position_size
-            
-            # Calculate scaled P&L
-            scaled_pnl = result.loc[i, 'PnL'] * position_size
-            result.loc[i, 'Scaled_PnL'] = scaled_pnl
-            
-            # Update capital
-            current_capital += scaled_pnl
-            result.loc[i, 'EndingBR'] = current_capital
-            
-            # Calculate cumulative P&L from starting capital
-            result.loc[i, 'Cumulative_PnL'] = current_capital - starting_capital
+        # Attach the computed columns in one go rather than writing row by row;
+        # a shallow copy shares the input's Date/PnL blocks instead of duplicating them
+        result = data.copy(deep=False)
+        result['StartingBR'] = starting_br
+        result['Position_Size'] = position_size
+        result['Scaled_PnL'] = scaled_pnl
+        result['EndingBR'] = ending_br
+        result['Cumulative_PnL'] = ending_br - starting_capital
         
         self.scaled_data = result
         return result
@@ -146,62 +389,47 @@ class StrategyCalculator:
         if self.original_data is None or self.scaled_data is None:
             return {}
         
-        # Original data metrics
-        original_total_pnl = self.original_data['PnL'].sum()
-        original_wins = (self.original_data['PnL'] > 0).sum()
-        original_losses = (self.original_data['PnL'] < 0).sum()
-        original_win_rate = original_wins / len(self.original_data) if len(self.original_data) > 0 else 0
-        original_avg_win = self.original_data[self.original_data['PnL'] > 0]['PnL'].mean() if original_wins > 0 else 0
-        original_avg_loss = self.original_data[self.original_data['PnL'] < 0]['PnL'].mean() if original_losses > 0 else 0
-        
-        # Calculate original drawdown
-        original_cumsum = self.original_data['PnL'].cumsum()
-        original_running_max = original_cumsum.expanding().max()
-        original_drawdown = original_cumsum - original_running_max
-        original_max_drawdown = original_drawdown.min()
-        
-        # Scaled data metrics
-        scaled_total_pnl = self.scaled_data['Scaled_PnL'].sum()
-        scaled_final_capital = self.scaled_data['EndingBR'].iloc[-1]
-        scaled_total_return_pct = (scaled_final_capital - self.starting_capital) / self.starting_capital * 100
-        
-        scaled_wins = (self.scaled_data['Scaled_PnL'] > 0).sum()
-        scaled_losses = (self.scaled_data['Scaled_PnL'] < 0).sum()
-        scaled_win_rate = scaled_wins / len(self.scaled_data) if len(self.scaled_data) > 0 else 0
-        scaled_avg_win = self.scaled_data[self.scaled_data['Scaled_PnL'] > 0]['Scaled_PnL'].mean() if scaled_wins > 0 else 0
-        scaled_avg_loss = self.scaled_data[self.scaled_data['Scaled_PnL'] < 0]['Scaled_PnL'].mean() if scaled_losses > 0 else 0
-        
-        # Calculate scaled drawdown
-        scaled_running_max = self.scaled_data['EndingBR'].expanding().max()
-        scaled_drawdown = self.scaled_data['EndingBR'] - scaled_running_max
-        scaled_max_drawdown = scaled_drawdown.min()
-        scaled_max_drawdown_pct = (scaled_max_drawdown / scaled_running_max.max() * 100) if scaled_running_max.max() > 0 else 0
+        if self._metrics_cache is not None:
+            return self._metrics_cache
+        
+        # Work on raw NumPy arrays so every metric is a single C-level reduction
+        pnl = self.original_data['PnL'].to_numpy(dtype=np.float64)
+        scaled_pnl = self.scaled_data['Scaled_PnL'].to_numpy(dtype=np.float64)
+        ending_br = self.scaled_data['EndingBR'].to_numpy(dtype=np.float64)
+        position_size = self.scaled_data['Position_Size'].to_numpy()
+        
+        original = _pnl_stats(pnl)
+        original['max_drawdown'], _ = _drawdown(np.cumsum(pnl))
+        
+        scaled = _pnl_stats(scaled_pnl)
+        scaled_max_drawdown, peak_capital = _drawdown(ending_br)
+        scaled_final_capital = ending_br[-1]
         
         # Position sizing metrics
-        max_position_size = self.scaled_data['Position_Size'].max()
-        avg_position_size = self.scaled_data['Position_Size'].mean()
-        min_position_size = self.scaled_data['Position_Size'].min()
+        max_position_size = position_size.max()
+        avg_position_size = position_size.mean()
+        min_position_size = position_size.min()
         
-        return {
+        self._metrics_cache = {
             'original': {
-                'total_pnl': original_total_pnl,
-                'win_rate': original_win_rate,
-                'avg_win': original_avg_win,
-                'avg_loss': original_avg_loss,
-                'max_drawdown': original_max_drawdown,
-                'total_trades': len(self.original_data)
+                'total_pnl': original['total_pnl'],
+                'win_rate': original['win_rate'],
+                'avg_win': original['avg_win'],
+                'avg_loss': original['avg_loss'],
+                'max_drawdown': original['max_drawdown'],
+                'total_trades': original['total_trades']
             },
             'scaled': {
                 'starting_capital': self.starting_capital,
                 'final_capital': scaled_final_capital,
-                'total_pnl': scaled_total_pnl,
-                'total_return_pct': scaled_total_return_pct,
-                'win_rate': scaled_win_rate,
-                'avg_win': scaled_avg_win,
-                'avg_loss': scaled_avg_loss,
+                'total_pnl': scaled['total_pnl'],
+                'total_return_pct': (scaled_final_capital - self.starting_capital) / self.starting_capital * 100,
+                'win_rate': scaled['win_rate'],
+                'avg_win': scaled['avg_win'],
+                'avg_loss': scaled['avg_loss'],
                 'max_drawdown': scaled_max_drawdown,
-                'max_drawdown_pct': scaled_max_drawdown_pct,
-                'total_trades': len(self.scaled_data)
+                'max_drawdown_pct': (scaled_max_drawdown / peak_capital * 100) if peak_capital > 0 else 0,
+                'total_trades': scaled['total_trades']
             },
             'position_sizing': {
                 'max_loss_used': self.max_loss,
@@ -211,6 +439,7 @@ class StrategyCalculator:
                 'min_position_size': min_position_size
             }
         }
+        return self._metrics_cache
     
     def get_weekly_data(self, data_type: str = 'scaled') -> pd.DataFrame:
         """
@@ -223,19 +452,25 @@ class StrategyCalculator:
             DataFrame with weekly aggregated data
         """
         if data_type == 'original' and self.original_data is not None:
-            df = self.original_data.copy()
+            df = self.original_data
             pnl_col = 'PnL'
         elif data_type == 'scaled' and self.scaled_data is not None:
-            df = self.scaled_data.copy()
+            df = self.scaled_data
             pnl_col = 'Scaled_PnL'
         else:
             return pd.DataFrame()
         
-        # Add week information
-        df['Week'] = df['Date'].dt.to_period('W')
+        # Number weeks from the first Monday after the epoch (1970-01-05) using
+        # int64 day arithmetic, then sum P&L per week with one weighted bincount
+        days = df['Date'].values.astype('datetime64[D]').view('i8')
+        weeks, inverse = np.unique((days - 4) // 7, return_inverse=True)
+        pnl_sum = np.bincount(inverse, weights=df[pnl_col].to_numpy(dtype=np.float64))
         
-        # Group by week and sum P&L
-        weekly = df.groupby('Week')[pnl_col].sum().reset_index()
-        weekly['Week_Start'] = weekly['Week'].dt.start_time
+        week_start = pd.to_datetime((weeks * 7 + 4).astype('datetime64[D]').astype('datetime64[ns]'))
+        weekly = pd.DataFrame({
+            'Week': week_start.to_period('W'),
+            pnl_col: pnl_sum,
+            'Week_Start': week_start
+        })
         
         return weekly
@@ -0,0 +1,149 @@
+"""
+Trading Strategy Scaling Calculator - Calculation Engine Regression Checks
+"""
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calculator import StrategyCalculator, _compound
+
+DESIGN_DIR = Path(__file__).parent / "design"
+# Read the way app.py reads the sample (a leading BOM is left in place)
+SAMPLE_CSV = (DESIGN_DIR / "SOURCE_DATA_EXAMPLE.csv").read_text()
+
+
+def _parse_with(csv_content: str, path: str) -> pd.DataFrame:
+    """Parse csv_content, steering parse_csv_data down one of its three parsers."""
+    calculator = StrategyCalculator()
+    if path == 'simple':
+        assert len(csv_content) < calculator.FAST_PARSE_MAX_CHARS
+    elif path == 'arrow':
+        # Trailing blank lines (common at the end of a spreadsheet paste) push
+        # the text past the fast path's size limit without changing the data
+        csv_content += '\n' * calculator.FAST_PARSE_MAX_CHARS
+    elif path == 'read_csv':
+        # Arrow accepts any well-formed paste, so disable both earlier paths
+        calculator._parse_simple = lambda content, delimiter: None
+        calculator._parse_arrow = lambda content, delimiter: None
+    return calculator.parse_csv_data(csv_content)
+
+
+class ParsePathTest(unittest.TestCase):
+    """Every parser behind parse_csv_data must produce the same frame."""
+
+    def setUp(self):
+        self.expected = StrategyCalculator().parse_csv_data(SAMPLE_CSV)
+
+    def test_sample_shape(self):
+        self.assertEqual(list(self.expected.columns), ['Date', 'PnL'])
+        self.assertEqual(len(self.expected), 193)
+        self.assertEqual(self.expected['Date'].dtype.kind, 'M')
+        self.assertEqual(self.expected['PnL'].dtype, np.float64)
+        self.assertTrue(self.expected['Date'].is_monotonic_increasing)
+
+    def test_delimiters_and_paths_agree(self):
+        for delimiter in (',', '\t', ';'):
+            text = SAMPLE_CSV.replace(',', delimiter)
+            for path in ('simple', 'arrow', 'read_csv'):
+                with self.subTest(delimiter=delimiter, path=path):
+                    pd.testing.assert_frame_equal(_parse_with(text, path), self.expected)
+
+    def test_quoted_cells_agree(self):
+        # Quotes send the paste past the fast path to Arrow
+        lines = SAMPLE_CSV.splitlines()
+        quoted = '\n'.join(lines[:1] + ['"' + line.replace(',', '","') + '"' for line in lines[1:]])
+        for path in ('arrow', 'read_csv'):
+            with self.subTest(path=path):
+                pd.testing.assert_frame_equal(_parse_with(quoted, path), self.expected)
+
+    def test_integer_pnl_is_float64_on_every_path(self):
+        text = 'Date,PnL\n2024-01-02,3\n2024-01-03,-2\n2024-01-04,5\n'
+        for path in ('simple', 'arrow', 'read_csv'):
+            with self.subTest(path=path):
+                self.assertEqual(_parse_with(text, path)['PnL'].dtype, np.float64)
+
+
+class ScalingResultTest(unittest.TestCase):
+    """Scaling the sample must reproduce the worked example in design/."""
+
+    def test_ending_balance_matches_example(self):
+        calculator = StrategyCalculator()
+        result = calculator.calculate_scaling(calculator.parse_csv_data(SAMPLE_CSV), 100.0, 0.1)
+
+        expected = pd.read_csv(DESIGN_DIR / "SCALED_100_10_DATA_EXAMPLE.csv", encoding='utf-8-sig')
+        self.assertEqual(len(result), len(expected))
+        np.testing.assert_array_equal(
+            result['Date'].to_numpy(),
+            pd.to_datetime(expected['D'], format='%m/%d/%Y').to_numpy(dtype=result['Date'].dtype)
+        )
+        # The example is rounded to cents
+        np.testing.assert_allclose(result['EndingBR'].to_numpy(), expected['PnL'].to_numpy(), rtol=0, atol=0.005)
+
+
+class WeeklyDataTest(unittest.TestCase):
+    """get_weekly_data must match a pandas weekly groupby."""
+
+    @staticmethod
+    def _groupby_weekly(df: pd.DataFrame, pnl_col: str) -> pd.DataFrame:
+        weekly = df.assign(Week=df['Date'].dt.to_period('W')).groupby('Week')[pnl_col].sum().reset_index()
+        weekly['Week_Start'] = weekly['Week'].dt.start_time
+        return weekly
+
+    def _check(self, data: pd.DataFrame):
+        calculator = StrategyCalculator()
+        calculator.calculate_scaling(data, 100.0, 0.1)
+        for data_type, df, pnl_col in (('original', data, 'PnL'),
+                                       ('scaled', calculator.scaled_data, 'Scaled_PnL')):
+            with self.subTest(data_type=data_type):
+                weekly = calculator.get_weekly_data(data_type)
+                expected = self._groupby_weekly(df, pnl_col)
+                self.assertEqual(list(weekly.columns), ['Week', pnl_col, 'Week_Start'])
+                self.assertTrue((weekly['Week'] == expected['Week']).all())
+                np.testing.assert_allclose(weekly[pnl_col].to_numpy(), expected[pnl_col].to_numpy(),
+                                           rtol=1e-12, atol=1e-9)
+                np.testing.assert_array_equal(weekly['Week_Start'].to_numpy(dtype='datetime64[ns]'),
+                                              expected['Week_Start'].to_numpy(dtype='datetime64[ns]'))
+
+    def test_sample(self):
+        self._check(StrategyCalculator().parse_csv_data(SAMPLE_CSV))
+
+    def test_weeks_before_the_epoch(self):
+        # Day numbers go negative before 1970, where the week bucketing must
+        # still floor toward the Monday (1970-01-01 was a Thursday)
+        rng = np.random.default_rng(1)
+        self._check(pd.DataFrame({
+            'Date': pd.date_range('1969-12-10', '1970-01-20', freq='D'),
+            'PnL': rng.normal(0.1, 1.0, 42).round(2)
+        }))
+
+
+class PositionSizeOverflowTest(unittest.TestCase):
+    """Position sizes that outgrow int64 must fail loudly, not wrap around."""
+
+    def setUp(self):
+        # 20,000 days of N(0.1, 1) P&L at 10% risk compounds $100 past the
+        # int64 position-size limit well before the last row
+        rng = np.random.default_rng(0)
+        self.pnl = rng.normal(0.1, 1.0, 20_000)
+
+    def test_both_kernel_paths_raise(self):
+        # py_func is the plain-Python body Numba compiled; without Numba
+        # _compound is that function already
+        for kernel in (_compound, getattr(_compound, 'py_func', _compound)):
+            with self.assertRaisesRegex(ValueError, 'Position size overflow'):
+                kernel(self.pnl, 100.0, 0.1, float(abs(self.pnl.min())))
+
+    def test_calculate_scaling_raises(self):
+        data = pd.DataFrame({
+            'Date': pd.date_range('2000-01-01', periods=len(self.pnl)),
+            'PnL': self.pnl
+        })
+        with self.assertRaisesRegex(ValueError, 'Position size overflow'):
+            StrategyCalculator().calculate_scaling(data, 100.0, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
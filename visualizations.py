@@ -3,11 +3,63 @@ Trading Strategy Scaling Calculator - Visualization Components
 """
 
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
+try:
+    from numba import njit, types
+except ImportError:  # Numba is optional; the equity curve then uses NumPy passes
+    njit = types = None
+
+# Hover templates are fixed strings, so they are built once here rather than
+# on every chart build
+_HOVER_BALANCE = '<b>Date:</b> %{x}<br><b>Account Balance:</b> $%{y:,.2f}<extra></extra>'
+_HOVER_DRAWDOWN = '<b>Date:</b> %{x}<br><b>Drawdown:</b> $%{y:,.2f}<extra></extra>'
+_HOVER_DAILY = '<b>Date:</b> %{x}<br><b>P&L:</b> $%{y:,.2f}<br><b>Running Total:</b> $%{base:,.2f}<extra></extra>'
+_HOVER_WEEKLY = '<b>Week:</b> %{x}<br><b>P&L:</b> $%{y:,.2f}<extra></extra>'
+_HOVER_POSITION = '<b>Date:</b> %{x}<br><b>Position Size:</b> %{y}<extra></extra>'
+
+
+def _equity_drawdown_numpy(pnl: np.ndarray, starting_capital: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the account balance and its drawdown from daily P&L.
+
+    Args:
+        pnl: P&L value for each day, oldest first
+        starting_capital: Balance before the first day
+
+    Returns:
+        Tuple of (balance, drawdown below the running peak) arrays
+    """
+    balance = starting_capital + np.cumsum(pnl)
+    return balance, balance - np.maximum.accumulate(balance)
+
+
+if njit is not None:
+    # Same result as the NumPy version in one pass instead of three (cumsum,
+    # running max, subtraction); compiled eagerly at import like the calculator
+    # kernels, with a read-only input type for pandas views
+    @njit(types.Tuple((types.float64[:], types.float64[:]))(
+        types.Array(types.float64, 1, 'A', readonly=True), types.float64), cache=True)
+    def _equity_drawdown(pnl, starting_capital):
+        """Single-pass equivalent of _equity_drawdown_numpy."""
+        n = pnl.shape[0]
+        balance = np.empty(n, dtype=np.float64)
+        drawdown = np.empty(n, dtype=np.float64)
+        total = 0.0
+        peak = -np.inf
+        for i in range(n):
+            total += pnl[i]
+            value = starting_capital + total
+            balance[i] = value
+            if value > peak:
+                peak = value
+            drawdown[i] = value - peak
+        return balance, drawdown
+else:
+    _equity_drawdown = _equity_drawdown_numpy
 
 
 class ChartTheme:
@@ -22,11 +74,14 @@ class ChartTheme:
     TEXT_SECONDARY = '#cccccc'
     TEXT_MUTED = '#888888'
     GRID_COLOR = '#333333'
+    LOSS_COLOR = '#ff4444'
+    LOSS_FILL = 'rgba(255, 68, 68, 0.3)'
     
     @classmethod
-    def get_layout_template(cls) -> Dict[str, Any]:
-        """Get the standard layout template for all charts."""
-        return {
+    @lru_cache(maxsize=None)
+    def get_layout_template(cls) -> Mapping[str, Any]:
+        """Get the standard layout template for all charts (built once; read-only, copy to extend)."""
+        return MappingProxyType({
             'plot_bgcolor': cls.BG_PRIMARY,
             'paper_bgcolor': cls.BG_PRIMARY,
             'font': {'color': cls.TEXT_PRIMARY, 'family': 'Arial, sans-serif'},
@@ -51,12 +106,47 @@ class ChartTheme:
                 'borderwidth': 1
             },
             'title': {'font': {'color': cls.ACCENT_PRIMARY, 'size': 16}}
-        }
+        })
+
+
+def _minmax_indices(max_points: int, *series: np.ndarray) -> np.ndarray:
+    """
+    Pick the rows to plot when a line has more points than the browser needs.
+
+    The rows are split into equal buckets and each series keeps its minimum and
+    maximum in every bucket (plus the first and last row), so peaks, troughs and
+    drawdowns survive at any zoom level.
+
+    Args:
+        max_points: Approximate number of points to keep
+        *series: Equal-length y arrays drawn against the same x values
+
+    Returns:
+        Sorted row indices to keep (all rows if there are already few enough)
+    """
+    n = len(series[0])
+    if n <= max_points:
+        return np.arange(n)
+
+    # Each bucket contributes up to two points per series
+    bucket = -(-n * 2 * len(series) // max_points)
+    full = n // bucket * bucket
+    offsets = np.arange(0, full, bucket)
+    keep = [np.array([0, n - 1])]
+    for y in series:
+        buckets = y[:full].reshape(-1, bucket)
+        keep += [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1)]
+        if full < n:
+            keep += [full + np.array([y[full:].argmin(), y[full:].argmax()])]
+    return np.unique(np.concatenate(keep))
 
 
 class VisualizationEngine:
     """Creates all chart visualizations for the trading strategy calculator."""
     
+    # Line charts longer than this are min/max decimated before plotting
+    MAX_LINE_POINTS = 4000
+    
     def __init__(self):
         self.theme = ChartTheme()
     
@@ -72,57 +162,68 @@ class VisualizationEngine:
         Returns:
             Plotly figure object
         """
-        fig = go.Figure()
-        
         if data_type == 'original':
             # For original data, show cumulative P&L + starting capital
-            y_values = starting_capital + data['PnL'].cumsum()
-            y_title = "Account Balance"
+            y_arr, drawdown = _equity_drawdown(data['PnL'].to_numpy(dtype=np.float64), float(starting_capital))
+            if drawdown.min() >= 0:
+                drawdown = None
             line_color = self.theme.ACCENT_SECONDARY
         else:
             # For scaled data, show ending bankroll
-            y_values = data['EndingBR']
-            y_title = "Account Balance"
+            y_arr = data['EndingBR'].to_numpy(dtype=np.float64)
+            # A balance that never falls has no drawdown, so the serial
+            # running-max pass is only needed once some day is a down day
+            drawdown = None
+            if (y_arr[1:] < y_arr[:-1]).any():
+                drawdown = y_arr - np.maximum.accumulate(y_arr)
             line_color = self.theme.ACCENT_PRIMARY
         
-        # Add equity curve
-        fig.add_trace(go.Scatter(
-            x=data['Date'],
-            y=y_values,
+        # Hand Plotly contiguous arrays rather than Series
+        dates = data['Date'].to_numpy()
+        
+        # Long histories are thinned to the points that shape each line
+        series = (y_arr,) if drawdown is None else (y_arr, drawdown)
+        keep = _minmax_indices(self.MAX_LINE_POINTS, *series)
+        if len(keep) < len(y_arr):
+            dates, y_arr = dates[keep], y_arr[keep]
+            if drawdown is not None:
+                drawdown = drawdown[keep]
+        
+        # Equity curve (WebGL keeps long histories responsive)
+        traces = [go.Scattergl(
+            x=dates,
+            y=y_arr,
             mode='lines',
             name='Equity Curve',
             line=dict(color=line_color, width=2),
-            hovertemplate='<b>Date:</b> %{x}<br><b>' + y_title + ':</b> $%{y:,.2f}<extra></extra>'
-        ))
-        
-        # Calculate and add drawdown
-        running_max = y_values.expanding().max()
-        drawdown = y_values - running_max
+            hovertemplate=_HOVER_BALANCE
+        )]
         
-        # Add drawdown as filled area (only if there are drawdowns)
-        if drawdown.min() < 0:
-            fig.add_trace(go.Scatter(
-                x=data['Date'],
+        # Drawdown as filled area (only if there are drawdowns)
+        if drawdown is not None:
+            traces.append(go.Scattergl(
+                x=dates,
                 y=drawdown,
                 mode='lines',
                 name='Drawdown',
-                line=dict(color='#ff4444', width=1),
+                line=dict(color=self.theme.LOSS_COLOR, width=1),
                 fill='tozeroy',
-                fillcolor='rgba(255, 68, 68, 0.3)',
-                hovertemplate='<b>Date:</b> %{x}<br><b>Drawdown:</b> $%{y:,.2f}<extra></extra>'
+                fillcolor=self.theme.LOSS_FILL,
+                hovertemplate=_HOVER_DRAWDOWN
             ))
         
         # Apply theme
-        layout = self.theme.get_layout_template()
-        layout.update({
+        layout = {
+            **self.theme.get_layout_template(),
             'title': title,
             'xaxis_title': 'Date',
-            'yaxis_title': y_title,
+            'yaxis_title': 'Account Balance',
             'hovermode': 'x unified'
-        })
+        }
         
-        fig.update_layout(**layout)
-        return fig
+        # Building the figure in one call validates it once, instead of again
+        # for every add_trace and update_layout
+        return go.Figure(data=traces, layout=layout)
     
     def create_daily_waterfall(self, data: pd.DataFrame, title: str, data_type: str = 'scaled', starting_capital: float = 100.0) -> go.Figure:
         """
@@ -137,52 +238,38 @@ class VisualizationEngine:
         Returns:
             Plotly figure object
         """
-        if data_type == 'original':
-            pnl_values = data['PnL']
-            # Calculate cumulative values starting from starting capital
-            cumulative = starting_capital + pnl_values.cumsum()
-            base_values = [starting_capital] + cumulative.iloc[:-1].tolist()
-        else:
-            pnl_values = data['Scaled_PnL']
-            # Use the actual starting and ending bankroll values
-            cumulative = data['EndingBR']
-            base_values = data['StartingBR'].tolist()
-
-        # Create waterfall chart using Plotly's waterfall trace
-        fig = go.Figure()
+        # The running total is Plotly's own waterfall base, so only the daily
+        # P&L is needed here
+        pnl_col = 'PnL' if data_type == 'original' else 'Scaled_PnL'
 
-        # Prepare data for waterfall
-        x_values = data['Date'].tolist()
-        y_values = pnl_values.tolist()
+        # Prepare data for waterfall; ndarrays serialize without a Python-object pass
+        x_values = data['Date'].to_numpy()
+        y_values = data[pnl_col].to_numpy()
 
-        # Create colors based on positive/negative values
-        colors = [self.theme.ACCENT_PRIMARY if x >= 0 else '#ff4444' for x in y_values]
-
-        # Add waterfall trace
-        fig.add_trace(go.Waterfall(
+        # Waterfall trace; every bar is 'relative', Plotly's default measure
+        trace = go.Waterfall(
             x=x_values,
             y=y_values,
-            measure=['relative'] * len(y_values),
-            text=[f'${x:,.2f}' for x in y_values],
+            # Bar labels are formatted by Plotly in the browser, not per row here
+            texttemplate='$%{y:,.2f}',
             textposition='outside',
             connector={'line': {'color': self.theme.GRID_COLOR, 'width': 1}},
             increasing={'marker': {'color': self.theme.ACCENT_PRIMARY}},
-            decreasing={'marker': {'color': '#ff4444'}},
+            decreasing={'marker': {'color': self.theme.LOSS_COLOR}},
             name='Daily P&L',
-            hovertemplate='<b>Date:</b> %{x}<br><b>P&L:</b> $%{y:,.2f}<br><b>Running Total:</b> $%{base:,.2f}<extra></extra>'
-        ))
+            hovertemplate=_HOVER_DAILY
+        )
 
         # Apply theme
-        layout = self.theme.get_layout_template()
-        layout.update({
+        layout = {
+            **self.theme.get_layout_template(),
             'title': title,
             'xaxis_title': 'Date',
             'yaxis_title': 'P&L Contribution',
             'showlegend': False
-        })
+        }
 
-        fig.update_layout(**layout)
-        return fig
+        return go.Figure(data=[trace], layout=layout)
     
     def create_weekly_waterfall(self, weekly_data: pd.DataFrame, title: str) -> go.Figure:
         """
@@ -197,11 +284,8 @@ class VisualizationEngine:
         """
         if weekly_data.empty:
             # Return empty chart if no data
-            fig = go.Figure()
-            layout = self.theme.get_layout_template()
-            layout.update({'title': title + ' (No Data)'})
-            fig.update_layout(**layout)
-            return fig
+            layout = {**self.theme.get_layout_template(), 'title': title + ' (No Data)'}
+            return go.Figure(layout=layout)
 
         # Determine the P&L column name - weekly data preserves original column names
         if 'Scaled_PnL' in weekly_data.columns:
@@ -212,35 +296,32 @@ class VisualizationEngine:
             # Fallback: use the second column (after Week)
             pnl_col = weekly_data.columns[1] if len(weekly_data.columns) > 1 else weekly_data.columns[0]
 
-        pnl_values = weekly_data[pnl_col]
-
-        fig = go.Figure()
+        week_starts = weekly_data['Week_Start'].to_numpy()
+        pnl_values = weekly_data[pnl_col].to_numpy(dtype=np.float64)
 
-        # Create waterfall chart
-        fig.add_trace(go.Waterfall(
-            x=weekly_data['Week_Start'],
+        # Waterfall trace
+        trace = go.Waterfall(
+            x=week_starts,
             y=pnl_values,
-            measure=['relative'] * len(pnl_values),
-            text=[f'${x:,.2f}' for x in pnl_values],
+            texttemplate='$%{y:,.2f}',
             textposition='outside',
             connector={'line': {'color': self.theme.GRID_COLOR, 'width': 1}},
             increasing={'marker': {'color': self.theme.ACCENT_PRIMARY}},
-            decreasing={'marker': {'color': '#ff4444'}},
+            decreasing={'marker': {'color': self.theme.LOSS_COLOR}},
             name='Weekly P&L',
-            hovertemplate='<b>Week:</b> %{x}<br><b>P&L:</b> $%{y:,.2f}<extra></extra>'
-        ))
+            hovertemplate=_HOVER_WEEKLY
+        )
 
         # Apply theme
-        layout = self.theme.get_layout_template()
-        layout.update({
+        layout = {
+            **self.theme.get_layout_template(),
             'title': title,
             'xaxis_title': 'Week',
             'yaxis_title': 'Weekly P&L Contribution',
             'showlegend': False
-        })
+        }
 
-        fig.update_layout(**layout)
-        return fig
+        return go.Figure(data=[trace], layout=layout)
     
     def create_position_size_chart(self, data: pd.DataFrame) -> go.Figure:
         """
@@ -252,30 +333,33 @@ class VisualizationEngine:
         Returns:
             Plotly figure object
         """
-        fig = go.Figure()
+        dates = data['Date'].to_numpy()
+        sizes = data['Position_Size'].to_numpy()
+        keep = _minmax_indices(self.MAX_LINE_POINTS, sizes)
+        if len(keep) < len(sizes):
+            dates, sizes = dates[keep], sizes[keep]
         
-        # Add position size line
-        fig.add_trace(go.Scatter(
-            x=data['Date'],
-            y=data['Position_Size'],
+        # Position size line (WebGL keeps long histories responsive)
+        trace = go.Scattergl(
+            x=dates,
+            y=sizes,
             mode='lines+markers',
             name='Position Size',
             line=dict(color=self.theme.ACCENT_SECONDARY, width=2),
             marker=dict(size=4, color=self.theme.ACCENT_PRIMARY),
-            hovertemplate='<b>Date:</b> %{x}<br><b>Position Size:</b> %{y}<extra></extra>'
-        ))
+            hovertemplate=_HOVER_POSITION
+        )
         
         # Apply theme
-        layout = self.theme.get_layout_template()
-        layout.update({
+        layout = {
+            **self.theme.get_layout_template(),
             'title': 'Position Size Over Time',
             'xaxis_title': 'Date',
             'yaxis_title': 'Position Size (Contracts)',
             'showlegend': False
-        })
+        }
         
-        fig.update_layout(**layout)
-        return fig
+        return go.Figure(data=[trace], layout=layout)
     
     def create_comparison_chart(self, original_data: pd.DataFrame, scaled_data: pd.DataFrame, starting_capital: float = 100.0) -> go.Figure:
         """
@@ -288,37 +372,46 @@ class VisualizationEngine:
         Returns:
             Plotly figure object
         """
-        fig = go.Figure()
+        # Original cumulative P&L + starting capital (both curves drawn with WebGL)
+        original_dates = original_data['Date'].to_numpy()
+        original_cumulative = starting_capital + np.cumsum(original_data['PnL'].to_numpy(dtype=np.float64))
+        scaled_dates = scaled_data['Date'].to_numpy()
+        scaled_balance = scaled_data['EndingBR'].to_numpy(dtype=np.float64)
+        
+        # Long histories are thinned to the points that shape each line
+        keep = _minmax_indices(self.MAX_LINE_POINTS, original_cumulative)
+        if len(keep) < len(original_cumulative):
+            original_dates, original_cumulative = original_dates[keep], original_cumulative[keep]
+        keep = _minmax_indices(self.MAX_LINE_POINTS, scaled_balance)
+        if len(keep) < len(scaled_balance):
+            scaled_dates, scaled_balance = scaled_dates[keep], scaled_balance[keep]
         
-        # Original cumulative P&L + starting capital
-        original_cumulative = starting_capital + original_data['PnL'].cumsum()
-        fig.add_trace(go.Scatter(
-            x=original_data['Date'],
+        traces = [go.Scattergl(
+            x=original_dates,
             y=original_cumulative,
             mode='lines',
             name='Original Strategy',
             line=dict(color=self.theme.TEXT_SECONDARY, width=2),
-            hovertemplate='<b>Date:</b> %{x}<br><b>Account Balance:</b> $%{y:,.2f}<extra></extra>'
-        ))
+            hovertemplate=_HOVER_BALANCE
+        ),
         
         # Scaled equity curve
-        fig.add_trace(go.Scatter(
-            x=scaled_data['Date'],
-            y=scaled_data['EndingBR'],
+        go.Scattergl(
+            x=scaled_dates,
+            y=scaled_balance,
             mode='lines',
             name='Scaled Strategy',
             line=dict(color=self.theme.ACCENT_PRIMARY, width=2),
-            hovertemplate='<b>Date:</b> %{x}<br><b>Account Balance:</b> $%{y:,.2f}<extra></extra>'
-        ))
+            hovertemplate=_HOVER_BALANCE
+        )]
         
         # Apply theme
-        layout = self.theme.get_layout_template()
-        layout.update({
+        layout = {
+            **self.theme.get_layout_template(),
             'title': 'Strategy Comparison: Original vs Scaled',
             'xaxis_title': 'Date',
             'yaxis_title': 'Value',
             'hovermode': 'x unified'
-        })
+        }
         
-        fig.update_layout(**layout)
-        return fig
+        return go.Figure(data=traces, layout=layout)